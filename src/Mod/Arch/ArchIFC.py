@@ -25,7 +25,7 @@
 and attributes of Arch/BIM objects.
 """
 
-import FreeCAD,json
+import FreeCAD,json,re
 
 if FreeCAD.GuiUp:
     from PySide.QtCore import QT_TRANSLATE_NOOP
@@ -35,10 +35,95 @@ else:
 
 import ArchIFCSchema
 
+# description given to all the properties representing IFC attributes
+IfcAttributeDescription = QT_TRANSLATE_NOOP("App::Property", "Description of IFC attributes are not yet implemented")
+
+# FreeCAD property type used to represent each IFC data type
+IfcPropertyTypes = {t: "App::" + v["property"] for t, v in ArchIFCSchema.IfcTypes.items()}
+
+# matches the position before each non-lowercase character, except the first
+_uncamelPattern = re.compile(r'(?<!^)(?=[^a-z])')
+
 def uncamel(t):
-    return ''.join(map(lambda x: x if x.islower() else " "+x, t[3:]))[1:]
+    return _uncamelPattern.sub(" ", t[3:])
+
+def _uncamelIfcTypes(schema):
+    return tuple(uncamel(t) for t in schema.keys())
+
+# canonicalised type names of the schemas used by Arch, computed once at import
+_canonicalisedIfcTypes = (
+    (ArchIFCSchema.IfcProducts, _uncamelIfcTypes(ArchIFCSchema.IfcProducts)),
+    (ArchIFCSchema.IfcContexts, _uncamelIfcTypes(ArchIFCSchema.IfcContexts)),
+)
+
+def canonicaliseIfcTypes(schema):
+    """Get the names of the IFC types of a schema, in the form used in Arch.
+
+    The names of ArchIFCSchema.IfcProducts and ArchIFCSchema.IfcContexts
+    are computed once at import. Other schemas are converted on each call.
+
+    Parameters
+    ----------
+    schema: dict
+        The IFC schema, such as ArchIFCSchema.IfcProducts.
+
+    Returns
+    -------
+    tuple of str
+        The canonicalised names, in the order of the schema's keys.
+    """
+
+    for knownSchema, names in _canonicalisedIfcTypes:
+        if schema is knownSchema:
+            return names
+    return _uncamelIfcTypes(schema)
+
+IfcTypes = list(canonicaliseIfcTypes(ArchIFCSchema.IfcProducts))
+# same as IfcTypes, for fast membership tests
+_ifcTypesSet = frozenset(IfcTypes)
+
+def _setOverallWidthExpression(obj, pl):
+    if "Length" in pl:
+        obj.setExpression("OverallWidth", "Length.Value")
+    elif "Width" in pl:
+        obj.setExpression("OverallWidth", "Width.Value")
+    else:
+        shape = obj.Shape
+        if shape:
+            bb = shape.BoundBox
+            if bb.XLength > bb.YLength:
+                obj.setExpression("OverallWidth", "Shape.BoundBox.XLength")
+            else:
+                obj.setExpression("OverallWidth", "Shape.BoundBox.YLength")
 
-IfcTypes = [uncamel(t) for t in ArchIFCSchema.IfcProducts.keys()]
+def _setOverallHeightExpression(obj, pl):
+    if "Height" in pl:
+        obj.setExpression("OverallHeight", "Height.Value")
+    else:
+        obj.setExpression("OverallHeight", "Shape.BoundBox.ZLength")
+
+def _setLongName(obj, pl):
+    obj.LongName = obj.Label
+
+def _expressionHandler(attributeName, propertyName, expression):
+    """Return a handler setting expression on the attribute if the object has propertyName."""
+    def handler(obj, pl):
+        if propertyName in pl:
+            obj.setExpression(attributeName, expression)
+    return handler
+
+# functions binding an IFC attribute to the object properties it mirrors,
+# by attribute name. See IfcRoot.addIfcAttributeValueExpressions()
+_ifcAttributeExpressionHandlers = {
+    "OverallWidth": _setOverallWidthExpression,
+    "OverallHeight": _setOverallHeightExpression,
+    "ElevationWithFlooring": _expressionHandler("ElevationWithFlooring", "Shape", "Shape.BoundBox.ZMin"),
+    "Elevation": _expressionHandler("Elevation", "Placement", "Placement.Base.z"),
+    "NominalDiameter": _expressionHandler("NominalDiameter", "Diameter", "Diameter.Value"),
+    "BarLength": _expressionHandler("BarLength", "Length", "Length.Value"),
+    "RefElevation": _expressionHandler("RefElevation", "Elevation", "Elevation.Value"),
+    "LongName": _setLongName,
+}
 
 class IfcRoot:
     """This class defines the common methods and properties for managing IFC data.
@@ -62,14 +147,16 @@ class IfcRoot:
         using the .migrateDeprecatedAttributes() method.
         """
 
-        if not "IfcData" in obj.PropertiesList:
+        pl = set(obj.PropertiesList)
+
+        if not "IfcData" in pl:
             obj.addProperty("App::PropertyMap","IfcData","IFC",QT_TRANSLATE_NOOP("App::Property","IFC data"))
 
-        if not "IfcType" in obj.PropertiesList:
+        if not "IfcType" in pl:
             obj.addProperty("App::PropertyEnumeration","IfcType","IFC",QT_TRANSLATE_NOOP("App::Property","The type of this object"))
             obj.IfcType = self.getCanonicalisedIfcTypes()
 
-        if not "IfcProperties" in obj.PropertiesList:
+        if not "IfcProperties" in pl:
             obj.addProperty("App::PropertyMap","IfcProperties","IFC",QT_TRANSLATE_NOOP("App::Property","IFC properties of this object"))
 
         self.migrateDeprecatedAttributes(obj)
@@ -159,9 +246,7 @@ class IfcRoot:
         name = "Ifc" + IfcType.replace(" ", "")
         if IfcType == "Undefined":
             name = "IfcBuildingElementProxy"
-        if name in self.getIfcSchema():
-            return self.getIfcSchema()[name]
-        return None
+        return self.getIfcSchema().get(name)
 
     def getIfcSchema(self):
         """Get the IFC schema of all types relevant to this class.
@@ -192,8 +277,7 @@ class IfcRoot:
             JSON, as per the .keys() method of dicts.
 
         """
-        schema = self.getIfcSchema()
-        return [''.join(map(lambda x: x if x.islower() else " "+x, t[3:]))[1:] for t in schema.keys()]
+        return list(canonicaliseIfcTypes(self.getIfcSchema()))
 
     def getIfcAttributeSchema(self, ifcTypeSchema, name):
         """Get the schema of an IFC attribute with the given name.
@@ -227,8 +311,9 @@ class IfcRoot:
         """Add the attributes of the IFC type's schema to the object's properties.
 
         Add the attributes as properties of the object. Also add the
-        attribute's schema within the object's IfcData property. Do so using
-        the .addIfcAttribute() method.
+        attribute's schema within the object's IfcData property. The schemas
+        of all the new attributes are written to IfcData at once, then the
+        properties are added using the .addIfcAttributeProperty() method.
 
         Also add expressions to copy data from the object's editable
         properties.  This means the IFC properties will remain accurate with
@@ -248,13 +333,28 @@ class IfcRoot:
             The schema of the IFC type.
         """
 
-        for attribute in ifcTypeSchema["attributes"]:
-            if attribute["name"] in obj.PropertiesList \
-                or attribute["name"] == "RefLatitude" \
-                or attribute["name"] == "RefLongitude" \
-                or attribute["name"] == "Name":
-                continue
-            self.addIfcAttribute(obj, attribute)
+        if not hasattr(obj, "IfcData"):
+            return
+        pl = set(obj.PropertiesList)
+        attributes = [attribute for attribute in ifcTypeSchema["attributes"]
+                      if attribute["name"] not in pl
+                      and attribute["name"] not in ("RefLatitude", "RefLongitude", "Name")]
+        if not attributes:
+            return
+
+        # store the schemas first, so that values set while adding the
+        # properties below are stored alongside them
+        IfcData = obj.IfcData
+        if "attributes" not in IfcData:
+            IfcData["attributes"] = "{}"
+        IfcAttributes = json.loads(IfcData["attributes"])
+        for attribute in attributes:
+            IfcAttributes[attribute["name"]] = attribute
+        IfcData["attributes"] = json.dumps(IfcAttributes)
+        obj.IfcData = IfcData
+
+        for attribute in attributes:
+            self.addIfcAttributeProperty(obj, attribute)
             self.addIfcAttributeValueExpressions(obj, attribute)
 
     def addIfcAttribute(self, obj, attribute):
@@ -263,7 +363,8 @@ class IfcRoot:
         Add the attribute's schema to the object's IfcData property, as an
         item under its "attributes" array.
 
-        Also add the attribute as a property of the object.
+        Also add the attribute as a property of the object, using the
+        .addIfcAttributeProperty() method.
 
         Parameters
         ----------
@@ -282,19 +383,31 @@ class IfcRoot:
         IfcData["attributes"] = json.dumps(IfcAttributes)
 
         obj.IfcData = IfcData
+        self.addIfcAttributeProperty(obj, attribute)
+
+    def addIfcAttributeProperty(self, obj, attribute):
+        """Add the property representing an IFC attribute to the object.
+
+        The attribute's schema is not stored in the IfcData property, see
+        .addIfcAttribute() for that.
+
+        Parameters
+        ----------
+        attribute: dict
+            The attribute to add. Should have the structure of an attribute
+            found within the IFC schemas.
+        """
         if attribute["is_enum"]:
             obj.addProperty("App::PropertyEnumeration",
                             attribute["name"],
                             "IFC Attributes",
-                            QT_TRANSLATE_NOOP("App::Property", "Description of IFC attributes are not yet implemented"))
+                            IfcAttributeDescription)
             setattr(obj, attribute["name"], attribute["enum_values"])
         else:
-            import ArchIFCSchema
-            propertyType = "App::" + ArchIFCSchema.IfcTypes[attribute["type"]]["property"]
-            obj.addProperty(propertyType,
+            obj.addProperty(IfcPropertyTypes[attribute["type"]],
                             attribute["name"],
                             "IFC Attributes",
-                            QT_TRANSLATE_NOOP("App::Property", "Description of IFC attributes are not yet implemented"))
+                            IfcAttributeDescription)
 
     def addIfcAttributeValueExpressions(self, obj, attribute):
         """Add expressions for IFC attributes, so they stay accurate with the object.
@@ -323,35 +436,14 @@ class IfcRoot:
             The schema of the attribute to add the expression for.
         """
 
-        if obj.getGroupOfProperty(attribute["name"]) != "IFC Attributes" \
-            or attribute["name"] not in obj.PropertiesList:
+        handler = _ifcAttributeExpressionHandlers.get(attribute["name"])
+        if handler is None:
             return
-        if attribute["name"] == "OverallWidth":
-            if "Length" in obj.PropertiesList:
-                obj.setExpression("OverallWidth", "Length.Value")
-            elif "Width" in obj.PropertiesList:
-                obj.setExpression("OverallWidth", "Width.Value")
-            elif obj.Shape and (obj.Shape.BoundBox.XLength > obj.Shape.BoundBox.YLength):
-                obj.setExpression("OverallWidth", "Shape.BoundBox.XLength")
-            elif obj.Shape:
-                obj.setExpression("OverallWidth", "Shape.BoundBox.YLength")
-        elif attribute["name"] == "OverallHeight":
-            if "Height" in obj.PropertiesList:
-                obj.setExpression("OverallHeight", "Height.Value")
-            else:
-                obj.setExpression("OverallHeight", "Shape.BoundBox.ZLength")
-        elif attribute["name"] == "ElevationWithFlooring" and "Shape" in obj.PropertiesList:
-            obj.setExpression("ElevationWithFlooring", "Shape.BoundBox.ZMin")
-        elif attribute["name"] == "Elevation" and "Placement" in obj.PropertiesList:
-            obj.setExpression("Elevation", "Placement.Base.z")
-        elif attribute["name"] == "NominalDiameter" and "Diameter" in obj.PropertiesList:
-            obj.setExpression("NominalDiameter", "Diameter.Value")
-        elif attribute["name"] == "BarLength" and "Length" in obj.PropertiesList:
-            obj.setExpression("BarLength", "Length.Value")
-        elif attribute["name"] == "RefElevation" and "Elevation" in obj.PropertiesList:
-            obj.setExpression("RefElevation", "Elevation.Value")
-        elif attribute["name"] == "LongName":
-            obj.LongName = obj.Label
+        pl = set(obj.PropertiesList)
+        if attribute["name"] not in pl \
+            or obj.getGroupOfProperty(attribute["name"]) != "IFC Attributes":
+            return
+        handler(obj, pl)
 
     def setObjIfcAttributeValue(self, obj, attributeName, value):
         """Change the value of an IFC attribute within the IfcData property's json.
@@ -419,32 +511,43 @@ class IfcRoot:
         https://standards.buildingsmart.org/IFC/RELEASE/IFC4/FINAL/HTML/schema/chapter-3.htm#enumeration
         """
 
+        # index the attributes by name once, instead of scanning them for each
+        # property. Keep the first one found, as getIfcAttributeSchema() does
+        attributes = {}
+        for attribute in ifcTypeSchema["attributes"]:
+            attributes.setdefault(attribute["name"].replace(' ', ''), attribute)
+        obsolete = []
         for property in obj.PropertiesList:
             if obj.getGroupOfProperty(property) != "IFC Attributes":
                 continue
-            ifcAttribute = self.getIfcAttributeSchema(ifcTypeSchema, property)
+            ifcAttribute = attributes.get(property)
             if ifcAttribute is None or ifcAttribute["is_enum"] is True:
-                obj.removeProperty(property)
+                obsolete.append(property)
+        # remove them once the scan is done, not while reading the properties
+        for property in obsolete:
+            obj.removeProperty(property)
 
     def migrateDeprecatedAttributes(self, obj):
         """Update the object to use the newer property names for IFC related properties.
         """
 
-        if "Role" in obj.PropertiesList:
+        pl = set(obj.PropertiesList)
+
+        if "Role" in pl:
             r = obj.Role
             obj.removeProperty("Role")
-            if r in IfcTypes:
+            if r in _ifcTypesSet:
                 obj.IfcType = r
                 FreeCAD.Console.PrintMessage("Upgrading "+obj.Label+" Role property to IfcType\n")
 
-        if "IfcRole" in obj.PropertiesList:
+        if "IfcRole" in pl:
             r = obj.IfcRole
             obj.removeProperty("IfcRole")
-            if r in IfcTypes:
+            if r in _ifcTypesSet:
                 obj.IfcType = r
                 FreeCAD.Console.PrintMessage("Upgrading "+obj.Label+" IfcRole property to IfcType\n")
 
-        if "IfcAttributes"in obj.PropertiesList:
+        if "IfcAttributes" in pl:
             obj.IfcData = obj.IfcAttributes
             obj.removeProperty("IfcAttributes")
 
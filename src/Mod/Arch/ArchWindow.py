@@ -55,11 +55,60 @@ __url__    = "https://www.freecadweb.org"
 # presets
 WindowPartTypes = ["Frame","Solid panel","Glass panel","Louvre"]
 AllowedHosts =    ["Wall","Structure","Roof"]
+# properties of a window that affect the hole it makes in its hosts
+WindowHostProperties = {"Base","WindowParts","Placement","HoleDepth","Height","Width","Hosts"}
 WindowOpeningModes = ["None","Arc 90","Arc 90 inv","Arc 45","Arc 45 inv","Arc 180",
                       "Arc 180 inv","Triangle","Triangle inv","Sliding","Sliding inv"]
+# angles in degrees at which the hinge chord is drawn for the plan symbol of each
+# opening mode: middle and end point of the arc, or end point of the triangle
+WindowSymbolAngles = {1:[45,90],2:[-45,-90],3:[22.5,45],4:[-22.5,-45],5:[90,180],6:[-90,-180],
+                      7:[90],8:[-90]}
 WindowPresets = ArchWindowPresets.WindowPresets
 
 
+def getHingeChord(face,ev1,enorm):
+
+    '''getHingeChord(face,ev1,enorm): returns the point of the face the most distant
+    from the hinge line defined by point ev1 and direction enorm, brought to the level
+    of ev1, and the chord vector from ev1 to that point. Returns (None,None) if the
+    face lies on the hinge line.'''
+
+    # find the point most distant from the hinge
+    d,p = max([(v.Point.distanceToLine(ev1,enorm),v.Point) for v in face.Vertexes],key=lambda dp: dp[0])
+    if d <= 0:
+        return None,None
+    # bring that point to the level of ev1 if needed
+    chord = p.sub(ev1)
+    proj = DraftVecUtils.project(chord,enorm)
+    if proj.Length > 0:
+        p = p.sub(proj)
+        chord = p.sub(ev1)
+    return p,chord
+
+
+def makeArcSymbol(p,v1,rchords):
+
+    "returns the plan symbol of an arc opening mode: an arc from p and the line back to the hinge"
+
+    import Part
+    v2,v3 = rchords
+    return [Part.Arc(p,v2,v3).toShape(),Part.LineSegment(v3,v1).toShape()]
+
+
+def makeTriangleSymbol(p,v1,rchords):
+
+    "returns the plan symbol of a triangle opening mode: two lines from p back to the hinge"
+
+    import Part
+    v2 = rchords[0]
+    return [Part.LineSegment(p,v2).toShape(),Part.LineSegment(v2,v1).toShape()]
+
+
+# plan symbol builders of the hinged opening modes. Sliding modes have no symbol
+WindowSymbolBuilders = {1:makeArcSymbol,2:makeArcSymbol,3:makeArcSymbol,4:makeArcSymbol,
+                        5:makeArcSymbol,6:makeArcSymbol,7:makeTriangleSymbol,8:makeTriangleSymbol}
+
+
 def makeWindow(baseobj=None,width=None,height=None,parts=None,name=None):
 
     '''makeWindow(baseobj,[width,height,parts,name]): creates a window based on the
@@ -533,7 +582,7 @@ class _Window(ArchComponent.Component):
 
     def setProperties(self,obj):
 
-        lp = obj.PropertiesList
+        lp = set(obj.PropertiesList)
         if not "Hosts" in lp:
             obj.addProperty("App::PropertyLinkList","Hosts","Window",QT_TRANSLATE_NOOP("App::Property","The objects that host this window"))
         if not "WindowParts" in lp:
@@ -582,14 +631,14 @@ class _Window(ArchComponent.Component):
 
     def onBeforeChange(self,obj,prop):
 
-        if prop in ["Base","WindowParts","Placement","HoleDepth","Height","Width","Hosts"]:
+        if prop in WindowHostProperties:
             setattr(self,prop,getattr(obj,prop))
 
     def onChanged(self,obj,prop):
 
         self.hideSubobjects(obj,prop)
         if not "Restore" in obj.State:
-            if prop in ["Base","WindowParts","Placement","HoleDepth","Height","Width","Hosts"]:
+            if prop in WindowHostProperties:
                 # anti-recursive loops, bc the base sketch will touch the Placement all the time
                 touchhosts = False
                 if hasattr(self,prop):
@@ -609,199 +658,138 @@ class _Window(ArchComponent.Component):
                 ArchComponent.Component.onChanged(self,obj,prop)
 
 
-    def buildShapes(self,obj):
+    def buildShapes(self,obj,symbolsonly=False):
 
-        import Part,DraftGeomUtils,math
+        # if symbolsonly is True, only the opening symbols are computed, and
+        # the costly extrusions and boolean cuts of the parts are skipped
+        import Part,DraftGeomUtils
         self.sshapes = []
         self.vshapes = []
         shapes = []
         rotdata = None
-        for i in range(int(len(obj.WindowParts)/5)):
+        # read the object properties only once, not for each window part
+        wparts = obj.WindowParts
+        if obj.Base:
+            basewires = obj.Base.Shape.Wires
+            baseedges = obj.Base.Shape.Edges
+        else:
+            basewires = []
+            baseedges = []
+        frame = obj.Frame.Value
+        offset = obj.Offset.Value
+        normal = None
+        if hasattr(obj,"Normal"):
+            if obj.Normal:
+                if not DraftVecUtils.isNull(obj.Normal):
+                    normal = obj.Normal
+        opening = None
+        if hasattr(obj,"Opening"):
+            if obj.Opening:
+                opening = obj.Opening/100.0
+        louvrewidth = None
+        louvrespacing = None
+        if hasattr(obj,"LouvreWidth"):
+            if obj.LouvreWidth and obj.LouvreSpacing:
+                louvrewidth = obj.LouvreWidth.Value
+                louvrespacing = obj.LouvreSpacing.Value
+        for i in range(int(len(wparts)/5)):
+            i5 = i*5
             wires = []
             hinge = None
             omode = None
             ssymbols = []
             vsymbols = []
-            wstr = obj.WindowParts[(i*5)+2].split(',')
+            wstr = wparts[i5+2].split(',')
             for s in wstr:
-                if "Wire" in s:
+                if s.startswith("Wire"):
                     j = int(s[4:])
-                    if obj.Base.Shape.Wires:
-                        if len(obj.Base.Shape.Wires) >= j:
-                            wires.append(obj.Base.Shape.Wires[j])
-                elif "Edge" in s:
+                    if basewires:
+                        if len(basewires) >= j:
+                            wires.append(basewires[j])
+                elif s.startswith("Edge"):
                     hinge = int(s[4:])-1
-                elif "Mode" in s:
+                elif s.startswith("Mode"):
                     omode = int(s[4:])
                     if omode >= len(WindowOpeningModes):
                         # Ignore modes not listed in WindowOpeningModes
                         omode = None
             if wires:
-                max_length = 0
-                for w in wires:
-                    if w.BoundBox.DiagonalLength > max_length:
-                        max_length = w.BoundBox.DiagonalLength
-                        ext = w
-                wires.remove(ext)
+                # the biggest wire is the outline, the others are holes
+                lengths = [w.BoundBox.DiagonalLength for w in wires]
+                ext = wires.pop(lengths.index(max(lengths)))
                 shape = Part.Face(ext)
-                norm = shape.normalAt(0,0)
-                if hasattr(obj,"Normal"):
-                    if obj.Normal:
-                        if not DraftVecUtils.isNull(obj.Normal):
-                            norm = obj.Normal
+                if normal:
+                    norm = normal
+                else:
+                    norm = shape.normalAt(0,0)
+                zov = None
+                if wparts[i5+4]:
+                    V = 0
+                    zof = wparts[i5+4]
+                    if "+V" in zof:
+                        zof = zof[:-2]
+                        V = offset
+                    zof = float(zof) + V
+                    if zof:
+                        zov = DraftVecUtils.scaleTo(norm,zof)
                 if hinge and omode:
-                    opening = None
-                    if hasattr(obj,"Opening"):
-                        if obj.Opening:
-                            opening = obj.Opening/100.0
-                    e = obj.Base.Shape.Edges[hinge]
+                    e = baseedges[hinge]
                     ev1 = e.Vertexes[0].Point
                     ev2 = e.Vertexes[-1].Point
                     # choose the one with lowest z to draw the symbol
                     if ev2.z < ev1.z:
                         ev1,ev2 = ev2,ev1
-                    # find the point most distant from the hinge
-                    p = None
-                    d = 0
-                    for v in shape.Vertexes:
-                        dist = v.Point.distanceToLine(ev1,ev2.sub(ev1))
-                        if dist > d:
-                            d = dist
-                            p = v.Point
+                    enorm = ev2.sub(ev1)
+                    p,chord = getHingeChord(shape,ev1,enorm)
                     if p:
-                        # bring that point to the level of ev1 if needed
-                        chord = p.sub(ev1)
-                        enorm = ev2.sub(ev1)
-                        proj = DraftVecUtils.project(chord,enorm)
                         v1 = ev1
-                        if proj.Length > 0:
-                            #chord = p.sub(ev1.add(proj))
-                            #p = v1.add(chord)
-                            p = p.sub(proj)
-                            chord = p.sub(ev1)
+                        if zov:
+                            # build the symbols directly at their offset position
+                            ev1 = ev1.add(zov)
+                            ev2 = ev2.add(zov)
+                            p = p.add(zov)
+                            v1 = ev1
                         # calculate symbols
-                        v4 = p.add(DraftVecUtils.scale(enorm,0.5))
-                        if omode == 1: # Arc 90
-                            v2 = v1.add(DraftVecUtils.rotate(chord,math.pi/4,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,math.pi/2,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
+                        builder = WindowSymbolBuilders.get(omode)
+                        if builder:
+                            # rotate the chord once for each angle used by this mode
+                            rchords = [v1.add(FreeCAD.Rotation(enorm,a).multVec(chord)) for a in WindowSymbolAngles[omode]]
+                            ssymbols.extend(builder(p,v1,rchords))
+                            v4 = p.add(DraftVecUtils.scale(enorm,0.5))
                             vsymbols.append(Part.LineSegment(v1,v4).toShape())
                             vsymbols.append(Part.LineSegment(v4,ev2).toShape())
                             if opening:
-                                rotdata = [v1,ev2.sub(ev1),90*opening]
-                        elif omode == 2: # Arc -90
-                            v2 = v1.add(DraftVecUtils.rotate(chord,-math.pi/4,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,-math.pi/2,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),-90*opening]
-                        elif omode == 3: # Arc 45
-                            v2 = v1.add(DraftVecUtils.rotate(chord,math.pi/8,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,math.pi/4,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),45*opening]
-                        elif omode == 4: # Arc -45
-                            v2 = v1.add(DraftVecUtils.rotate(chord,-math.pi/8,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,-math.pi/4,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),-45*opening]
-                        elif omode == 5: # Arc 180
-                            v2 = v1.add(DraftVecUtils.rotate(chord,math.pi/2,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,math.pi,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),180*opening]
-                        elif omode == 6: # Arc -180
-                            v2 = v1.add(DraftVecUtils.rotate(chord,-math.pi/2,enorm))
-                            v3 = v1.add(DraftVecUtils.rotate(chord,-math.pi,enorm))
-                            ssymbols.append(Part.Arc(p,v2,v3).toShape())
-                            ssymbols.append(Part.LineSegment(v3,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [ev1,ev2.sub(ev1),-180*opening]
-                        elif omode == 7: # tri
-                            v2 = v1.add(DraftVecUtils.rotate(chord,math.pi/2,enorm))
-                            ssymbols.append(Part.LineSegment(p,v2).toShape())
-                            ssymbols.append(Part.LineSegment(v2,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),90*opening]
-                        elif omode == 8: # -tri
-                            v2 = v1.add(DraftVecUtils.rotate(chord,-math.pi/2,enorm))
-                            ssymbols.append(Part.LineSegment(p,v2).toShape())
-                            ssymbols.append(Part.LineSegment(v2,v1).toShape())
-                            vsymbols.append(Part.LineSegment(v1,v4).toShape())
-                            vsymbols.append(Part.LineSegment(v4,ev2).toShape())
-                            if opening:
-                                rotdata = [v1,ev2.sub(ev1),-90*opening]
-                        elif omode == 9: # sliding
-                            pass
-                        elif omode == 10: # -sliding
-                            pass
+                                rotdata = [v1,enorm,WindowSymbolAngles[omode][-1]*opening]
                 V = 0
-                thk = obj.WindowParts[(i*5)+3]
+                thk = wparts[i5+3]
                 if "+V" in thk:
                     thk = thk[:-2]
-                    V = obj.Frame.Value
+                    V = frame
                 thk = float(thk) + V
-                if thk:
+                if thk and not symbolsonly:
                     exv = DraftVecUtils.scaleTo(norm,thk)
                     shape = shape.extrude(exv)
-                    for w in wires:
-                        f = Part.Face(w)
-                        f = f.extrude(exv)
-                        shape = shape.cut(f)
-                if obj.WindowParts[(i*5)+4]:
-                    V = 0
-                    zof = obj.WindowParts[(i*5)+4]
-                    if "+V" in zof:
-                        zof = zof[:-2]
-                        V = obj.Offset.Value
-                    zof = float(zof) + V
-                    if zof:
-                        zov = DraftVecUtils.scaleTo(norm,zof)
-                        shape.translate(zov)
-                        for symb in ssymbols:
-                            symb.translate(zov)
-                        for symb in vsymbols:
-                            symb.translate(zov)
-                        if rotdata and hinge and omode:
-                            rotdata[0] = rotdata[0].add(zov)
-                if obj.WindowParts[(i*5)+1] == "Louvre":
-                    if hasattr(obj,"LouvreWidth"):
-                        if obj.LouvreWidth and obj.LouvreSpacing:
-                            bb = shape.BoundBox
-                            bb.enlarge(10)
-                            step = obj.LouvreWidth.Value+obj.LouvreSpacing.Value
-                            if step < bb.ZLength:
-                                box = Part.makeBox(bb.XLength,bb.YLength,obj.LouvreSpacing.Value)
-                                boxes = []
-                                for i in range(int(bb.ZLength/step)+1):
-                                    b = box.copy()
-                                    b.translate(FreeCAD.Vector(bb.XMin,bb.YMin,bb.ZMin+i*step))
-                                    boxes.append(b)
-                                self.boxes = Part.makeCompound(boxes)
-                                #rot = obj.Base.Placement.Rotation
-                                #self.boxes.rotate(self.boxes.BoundBox.Center,rot.Axis,math.degrees(rot.Angle))
-                                self.boxes.translate(shape.BoundBox.Center.sub(self.boxes.BoundBox.Center))
-                                shape = shape.cut(self.boxes)
+                    if wires:
+                        # cut all the holes in one boolean operation
+                        holes = Part.makeCompound([Part.Face(w).extrude(exv) for w in wires])
+                        shape = shape.cut(holes)
+                if zov:
+                    shape.translate(zov)
+                if (wparts[i5+1] == "Louvre") and not symbolsonly:
+                    if louvrewidth:
+                        bb = shape.BoundBox
+                        bb.enlarge(10)
+                        step = louvrewidth+louvrespacing
+                        if step < bb.ZLength:
+                            n = int(bb.ZLength/step)+1
+                            # place the boxes directly centered on the shape,
+                            # bb is enlarged evenly so only z needs an offset
+                            zmin = bb.ZMin+(bb.ZLength-((n-1)*step+louvrespacing))/2.0
+                            box = Part.makeBox(bb.XLength,bb.YLength,louvrespacing,FreeCAD.Vector(bb.XMin,bb.YMin,zmin))
+                            self.boxes = Part.makeCompound([box.translated(FreeCAD.Vector(0,0,k*step)) for k in range(n)])
+                            #rot = obj.Base.Placement.Rotation
+                            #self.boxes.rotate(self.boxes.BoundBox.Center,rot.Axis,math.degrees(rot.Angle))
+                            shape = shape.cut(self.boxes)
                 if rotdata:
                     shape.rotate(rotdata[0],rotdata[1],rotdata[2])
                 shapes.append(shape)
@@ -814,7 +802,8 @@ class _Window(ArchComponent.Component):
         if self.clone(obj):
             clonedProxy = obj.CloneOf.Proxy
             if not (hasattr(clonedProxy, "sshapes") and hasattr(clonedProxy, "vshapes")):
-                clonedProxy.buildShapes(obj.CloneOf)
+                # only the symbols are used here, the shapes come from the original
+                clonedProxy.buildShapes(obj.CloneOf,symbolsonly=True)
             self.sshapes = clonedProxy.sshapes
             self.vshapes = clonedProxy.vshapes
             if hasattr(clonedProxy, "boxes"):
@@ -828,12 +817,13 @@ class _Window(ArchComponent.Component):
         self.vshapes = []
         if obj.Base:
             if hasattr(obj,'Shape'):
-                if hasattr(obj,"WindowParts"):
-                    if obj.WindowParts and (len(obj.WindowParts)%5 == 0):
+                wparts = getattr(obj,"WindowParts",None)
+                if wparts is not None:
+                    if wparts and (len(wparts)%5 == 0):
                         shapes = self.buildShapes(obj)
                         if shapes:
                             base = Part.makeCompound(shapes)
-                    elif not obj.WindowParts:
+                    elif not wparts:
                         if not obj.Base.Shape.isNull():
                             base = obj.Base.Shape.copy()
                             # obj placement is already added by applyShape() below
@@ -846,20 +836,17 @@ class _Window(ArchComponent.Component):
         if base:
             if not base.isNull():
                 b = []
-                if self.sshapes:
-                    if hasattr(obj,"SymbolPlan"):
-                        if obj.SymbolPlan:
-                            b.extend(self.sshapes)
-                    else:
-                        b.extend(self.sshapes)
-                if self.vshapes:
-                    if hasattr(obj,"SymbolElevation"):
-                        if obj.SymbolElevation:
-                            b.extend(self.vshapes)
-                    else:
-                        b.extend(self.vshapes)
+                # symbols are shown by default on objects without the properties
+                if self.sshapes and getattr(obj,"SymbolPlan",True):
+                    b.extend(self.sshapes)
+                if self.vshapes and getattr(obj,"SymbolElevation",True):
+                    b.extend(self.vshapes)
                 if b:
-                    base = Part.makeCompound([base]+b)
+                    if base.ShapeType == "Compound":
+                        # add the symbols to the parts compound instead of nesting it
+                        base = Part.makeCompound(base.childShapes()+b)
+                    else:
+                        base = Part.makeCompound([base]+b)
                     #base = Part.makeCompound([base]+self.sshapes+self.vshapes)
                 self.applyShape(obj,base,pl,allowinvalid=True,allownosolid=True)
                 obj.Placement = pl
@@ -883,6 +870,18 @@ class _Window(ArchComponent.Component):
                         sh.Placement = pl
                         return sh
 
+        # reuse the last computed subvolume if the base shape and the
+        # properties it depends on did not change since then. Clones also
+        # depend on the original's properties, so they are not cached
+        key = None
+        if obj.Base and hasattr(obj.Base,"Shape") and not Draft.isClone(obj,"Window"):
+            key = [obj.Base.Shape,getattr(obj,"HoleDepth",None),getattr(obj,"HoleWire",None),
+                   getattr(obj,"Normal",None),FreeCAD.Placement(plac) if plac else obj.Placement]
+            cache = getattr(self,"subVolumeCache",None)
+            if cache and cache[0][0].isSame(key[0]) and (cache[0][1:] == key[1:]):
+                # a shallow copy, sharing the geometry of the cached solid
+                return cache[1].copy(False)
+
         # getting extrusion depth
         base = None
         if obj.Base:
@@ -964,6 +963,8 @@ class _Window(ArchComponent.Component):
                 f.Placement = plac
             else:
                 f.Placement = obj.Placement
+            if key:
+                self.subVolumeCache = (key,f.copy(False))
             return f
         return None
 
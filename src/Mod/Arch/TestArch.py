@@ -493,6 +493,54 @@ class ArchTest(unittest.TestCase):
         Arch.removeComponents(win,host=w)
         self.failUnless(win,"Arch Window failed")
 
+    def testWindowSymbols(self):
+        App.Console.PrintLog ('Checking Arch Window symbols...\n')
+        # a square window in the XZ plane, hinged on its right edge
+        base = App.ActiveDocument.addObject("Part::Feature","WindowBase")
+        base.Shape = Part.makePolygon([App.Vector(0,0,0),App.Vector(1000,0,0),
+                                       App.Vector(1000,0,1000),App.Vector(0,0,1000),
+                                       App.Vector(0,0,0)])
+        win = Arch.makeWindow(base,parts=["Leaf","Solid panel","Wire0,Edge2,Mode1","50","100"])
+        win.Normal = App.Vector(0,1,0)
+        App.ActiveDocument.recompute()
+        # the symbols are moved by the part offset of 100 along the normal
+        expected = [[App.Vector(0,100,0),App.Vector(1000,-900,0)],
+                    [App.Vector(1000,-900,0),App.Vector(1000,100,0)],
+                    [App.Vector(1000,100,0),App.Vector(0,100,500)],
+                    [App.Vector(0,100,500),App.Vector(1000,100,1000)]]
+        symbols = win.Proxy.sshapes + win.Proxy.vshapes
+        self.assertEqual(len(symbols),len(expected),"Arch Window symbols failed")
+        for symbol,points in zip(symbols,expected):
+            self.failUnless(symbol.Vertexes[0].Point.isEqual(points[0],1e-6),
+                            "Arch Window symbols failed")
+            self.failUnless(symbol.Vertexes[-1].Point.isEqual(points[1],1e-6),
+                            "Arch Window symbols failed")
+        # the opening arc turns around the offset hinge
+        self.failUnless(win.Proxy.sshapes[0].Edges[0].Curve.Center.isEqual(App.Vector(1000,100,0),1e-6),
+                        "Arch Window symbols failed")
+
+    def testWindowLouvres(self):
+        App.Console.PrintLog ('Checking Arch Window louvres...\n')
+        # a square window in the XZ plane, 50 thick along Y
+        base = App.ActiveDocument.addObject("Part::Feature","WindowBase")
+        base.Shape = Part.makePolygon([App.Vector(0,0,0),App.Vector(1000,0,0),
+                                       App.Vector(1000,0,1000),App.Vector(0,0,1000),
+                                       App.Vector(0,0,0)])
+        win = Arch.makeWindow(base,parts=["Louvres","Louvre","Wire0","50","0"])
+        win.Normal = App.Vector(0,1,0)
+        win.LouvreWidth = 100
+        win.LouvreSpacing = 100
+        App.ActiveDocument.recompute()
+        # 6 boxes spaced by 200 on the enlarged bounding box (-10 to 1010 in Z),
+        # centered on the part, as the former algorithm placed them
+        boxes = win.Proxy.boxes
+        self.assertEqual(len(boxes.Solids),6,"Arch Window louvres failed")
+        bb = boxes.BoundBox
+        ptMin = App.Vector(bb.XMin,bb.YMin,bb.ZMin)
+        ptMax = App.Vector(bb.XMax,bb.YMax,bb.ZMax)
+        self.failUnless(ptMin.isEqual(App.Vector(-10,-10,-50),1e-3),"Arch Window louvres failed")
+        self.failUnless(ptMax.isEqual(App.Vector(1010,60,1050),1e-3),"Arch Window louvres failed")
+
     def testRoof(self):
         App.Console.PrintLog ('Checking Arch Roof...\n')
         r = Draft.makeRectangle(length=2,height=-1)
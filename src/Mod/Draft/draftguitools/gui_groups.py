@@ -354,27 +354,31 @@ class AddToConstruction(gui_base.GuiCommandSimplest):
         col = Gui.draftToolBar.getDefaultColor("constr")
         col = (float(col[0]), float(col[1]), float(col[2]), 0.0)
 
-        # Get the construction group or create it if it doesn't exist
-        gname = utils.get_param("constructiongroupname", "Construction")
-        grp = self.doc.getObject(gname)
-        if not grp:
-            grp = self.doc.addObject("App::DocumentObjectGroup", gname)
-
-        for obj in Gui.Selection.getSelection():
-            grp.addObject(obj)
-
-            # Change the appearance to the construction colors
-            vobj = obj.ViewObject
-            if "TextColor" in vobj.PropertiesList:
-                vobj.TextColor = col
-            if "PointColor" in vobj.PropertiesList:
-                vobj.PointColor = col
-            if "LineColor" in vobj.PropertiesList:
-                vobj.LineColor = col
-            if "ShapeColor" in vobj.PropertiesList:
-                vobj.ShapeColor = col
-            if hasattr(vobj, "Transparency"):
-                vobj.Transparency = 80
+        self.doc.openTransaction("Add to construction group")
+        try:
+            # Get the construction group or create it if it doesn't exist
+            gname = utils.get_param("constructiongroupname", "Construction")
+            grp = self.doc.getObject(gname)
+            if not grp:
+                grp = self.doc.addObject("App::DocumentObjectGroup", gname)
+
+            # Add the whole selection at once instead of one object at a time
+            sel = Gui.Selection.getSelection()
+            grp.addObjects(sel)
+
+            for obj in sel:
+                # Change the appearance to the construction colors
+                vobj = obj.ViewObject
+                props = set(vobj.PropertiesList)
+                for prop in ("TextColor", "PointColor", "LineColor", "ShapeColor"):
+                    if prop in props:
+                        setattr(vobj, prop, col)
+                if "Transparency" in props:
+                    vobj.Transparency = 80
+        except Exception:
+            self.doc.abortTransaction()
+            raise
+        self.doc.commitTransaction()
 
 
 Draft_AddConstruction = AddToConstruction
@@ -56,28 +56,23 @@ class BaseMode(gui_base.GuiCommandSimplest):
     and other behavior. See this class for more information.
     """
 
-    def Activated(self, mode="None"):
+    def Activated(self):
         """Execute when the command is called.
 
-        Parameters
-        ----------
-        action: str
-            Indicates the type of mode to switch to.
-            It can be `'construction'` or `'continue'`.
+        Returns
+        -------
+        DraftToolbar
+            The `DraftToolbar` whose mode the subclass should toggle.
+        None
+            If there is no Draft toolbar.
         """
         super(BaseMode, self).Activated()
 
         if hasattr(Gui, "draftToolBar"):
-            _ui = Gui.draftToolBar
+            return Gui.draftToolBar
         else:
             _msg(translate("draft","No active Draft Toolbar."))
-            return
-
-        if _ui is not None:
-            if mode == "construction" and hasattr(_ui, "constrButton"):
-                _ui.constrButton.toggle()
-            elif mode == "continue":
-                _ui.toggleContinue()
+            return None
 
 
 class ToggleConstructionMode(BaseMode):
@@ -107,7 +102,9 @@ class ToggleConstructionMode(BaseMode):
         It calls the `toggle()` method of the construction button
         in the `DraftToolbar` class.
         """
-        super(ToggleConstructionMode, self).Activated(mode="construction")
+        _ui = super(ToggleConstructionMode, self).Activated()
+        if _ui is not None and hasattr(_ui, "constrButton"):
+            _ui.constrButton.toggle()
 
 
 Gui.addCommand('Draft_ToggleConstructionMode', ToggleConstructionMode())
@@ -137,7 +134,9 @@ class ToggleContinueMode(BaseMode):
 
         It calls the `toggleContinue()` method of the `DraftToolbar` class.
         """
-        super(ToggleContinueMode, self).Activated(mode="continue")
+        _ui = super(ToggleContinueMode, self).Activated()
+        if _ui is not None:
+            _ui.toggleContinue()
 
 
 Gui.addCommand('Draft_ToggleContinueMode', ToggleContinueMode())
@@ -177,12 +176,14 @@ class ToggleDisplayMode(gui_base.GuiCommandNeedsSelection):
         super(ToggleDisplayMode, self).Activated()
 
         for obj in Gui.Selection.getSelection():
-            if obj.ViewObject.DisplayMode == "Flat Lines":
-                if "Wireframe" in obj.ViewObject.listDisplayModes():
-                    obj.ViewObject.DisplayMode = "Wireframe"
-            elif obj.ViewObject.DisplayMode == "Wireframe":
-                if "Flat Lines" in obj.ViewObject.listDisplayModes():
-                    obj.ViewObject.DisplayMode = "Flat Lines"
+            vobj = obj.ViewObject
+            mode = vobj.DisplayMode
+            if mode == "Flat Lines":
+                if "Wireframe" in vobj.listDisplayModes():
+                    vobj.DisplayMode = "Wireframe"
+            elif mode == "Wireframe":
+                if "Flat Lines" in vobj.listDisplayModes():
+                    vobj.DisplayMode = "Flat Lines"
 
 
 Gui.addCommand('Draft_ToggleDisplayMode', ToggleDisplayMode())
@@ -58,6 +58,8 @@ def make_clone(obj, delta=None, forcedraft=False):
     
     """
 
+    doc = App.ActiveDocument
+    gui = App.GuiUp
     prefix = utils.get_param("ClonePrefix","")
 
     cl = None
@@ -68,14 +70,19 @@ def make_clone(obj, delta=None, forcedraft=False):
     if not isinstance(obj,list):
         obj = [obj]
 
+    # the type of a single object, looked up only once
+    obj_type = None
+    if len(obj) == 1:
+        obj_type = utils.get_type(obj[0])
+
     if (len(obj) == 1) and obj[0].isDerivedFrom("Part::Part2DObject"):
-        cl = App.ActiveDocument.addObject("Part::Part2DObjectPython","Clone2D")
+        cl = doc.addObject("Part::Part2DObjectPython","Clone2D")
         cl.Label = prefix + obj[0].Label + " (2D)"
 
-    elif (len(obj) == 1) and (hasattr(obj[0],"CloneOf") or (utils.get_type(obj[0]) == "BuildingPart")) and (not forcedraft):
+    elif (len(obj) == 1) and (hasattr(obj[0],"CloneOf") or (obj_type == "BuildingPart")) and (not forcedraft):
         # arch objects can be clones
         import Arch
-        if utils.get_type(obj[0]) == "BuildingPart":
+        if obj_type == "BuildingPart":
             cl = Arch.makeComponent()
         else:
             try:
@@ -90,7 +97,7 @@ def make_clone(obj, delta=None, forcedraft=False):
             cl.CloneOf = base
             if hasattr(cl,"Material") and hasattr(obj[0],"Material"):
                 cl.Material = obj[0].Material
-            if utils.get_type(obj[0]) != "BuildingPart":
+            if obj_type != "BuildingPart":
                 cl.Placement = obj[0].Placement
             try:
                 cl.Role = base.Role
@@ -98,20 +105,26 @@ def make_clone(obj, delta=None, forcedraft=False):
                 cl.Tag = base.Tag
             except Exception:
                 pass
-            if App.GuiUp:
+            if gui:
                 gui_utils.format_object(cl,base)
                 cl.ViewObject.DiffuseColor = base.ViewObject.DiffuseColor
-                if utils.get_type(obj[0]) in ["Window","BuildingPart"]:
+                if obj_type in ("Window","BuildingPart"):
                     ToDo.delay(Arch.recolorize,cl)
             gui_utils.select(cl)
             return cl
     # fall back to Draft clone mode
     if not cl:
-        cl = App.ActiveDocument.addObject("Part::FeaturePython","Clone")
+        cl = doc.addObject("Part::FeaturePython","Clone")
         cl.addExtension("Part::AttachExtensionPython")
         cl.Label = prefix + obj[0].Label
+    _finalize_draft_clone(cl, obj, delta, gui)
+    return cl
+
+
+def _finalize_draft_clone(cl, obj, delta, gui):
+    """Turn the given document object into a Draft clone of obj."""
     Clone(cl)
-    if App.GuiUp:
+    if gui:
         ViewProviderClone(cl.ViewObject)
     cl.Objects = obj
     if delta:
@@ -121,10 +134,9 @@ def make_clone(obj, delta=None, forcedraft=False):
     gui_utils.format_object(cl,obj[0])
     if hasattr(cl,"LongName") and hasattr(obj[0],"LongName"):
         cl.LongName = obj[0].LongName
-    if App.GuiUp and (len(obj) > 1):
+    if gui and (len(obj) > 1):
         cl.ViewObject.Proxy.resetColors(cl.ViewObject)
     gui_utils.select(cl)
-    return cl
 
 
 clone = make_clone
@@ -540,6 +540,76 @@ class DraftModification(unittest.TestCase):
         self.assertTrue(obj.hasExtension("Part::AttachExtension"),
                         "'{}' failed".format(operation))
 
+    def test_clone_base_cloneof(self):
+        """Follow a chain of objects linked by their CloneOf property."""
+        operation = "Draft get_clone_base CloneOf"
+        _msg("  Test '{}'".format(operation))
+        objs = []
+        for i in range(3):
+            obj = App.ActiveDocument.addObject("App::FeaturePython", "Obj")
+            obj.addProperty("App::PropertyLink", "CloneOf", "Base", "")
+            objs.append(obj)
+        objs[1].CloneOf = objs[0]
+        objs[2].CloneOf = objs[1]
+
+        _msg("  chain: {}".format([obj.Name for obj in objs]))
+        base = Draft.get_clone_base(objs[2])
+        self.assertEqual(base, objs[0], "'{}' failed".format(operation))
+        base = Draft.get_clone_base(objs[2], recursive=False)
+        self.assertEqual(base, objs[1], "'{}' failed".format(operation))
+
+    def test_clone_base_draft_clone(self):
+        """Follow a chain of Draft clones through their Objects property."""
+        operation = "Draft get_clone_base Clone"
+        _msg("  Test '{}'".format(operation))
+        box = App.ActiveDocument.addObject("Part::Box")
+        App.ActiveDocument.recompute()
+        clone1 = Draft.make_clone(box)
+        clone2 = Draft.make_clone(clone1)
+
+        _msg("  chain: {0}, {1}, {2}".format(box.Name,
+                                             clone1.Name, clone2.Name))
+        base = Draft.get_clone_base(clone2)
+        self.assertEqual(base, box, "'{}' failed".format(operation))
+        base = Draft.get_clone_base(clone2, recursive=False)
+        self.assertEqual(base, clone1, "'{}' failed".format(operation))
+
+    def test_clone_base_strict(self):
+        """Get the clone base of an object that is not a clone."""
+        operation = "Draft get_clone_base strict"
+        _msg("  Test '{}'".format(operation))
+        box = App.ActiveDocument.addObject("Part::Box")
+
+        base = Draft.get_clone_base(box)
+        self.assertEqual(base, box, "'{}' failed".format(operation))
+        base = Draft.get_clone_base(box, strict=True)
+        self.assertIs(base, False, "'{}' failed".format(operation))
+
+    def test_clone_base_cyclic(self):
+        """Get the clone base of two objects that are clones of each other.
+
+        The objects are plain Python stand-ins, so that no cyclic
+        dependency is created in the document.
+        """
+        operation = "Draft get_clone_base cyclic"
+        _msg("  Test '{}'".format(operation))
+
+        class Stub:
+            pass
+
+        doc = Stub()
+        doc.Name = self.doc_name
+        obj1 = Stub()
+        obj2 = Stub()
+        obj1.Document = obj2.Document = doc
+        obj1.Name = "Obj1"
+        obj2.Name = "Obj2"
+        obj1.CloneOf = obj2
+        obj2.CloneOf = obj1
+
+        base = Draft.get_clone_base(obj1)
+        self.assertIn(base, (obj1, obj2), "'{}' failed".format(operation))
+
     def test_draft_to_drawing(self):
         """Create a solid, and then a projected view in a Drawing page."""
         operation = "Draft Drawing"
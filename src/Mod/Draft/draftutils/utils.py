@@ -541,10 +541,9 @@ def get_clone_base(obj, strict=False, recursive=True):
 
     recursive: bool, optional
         It defaults to `True`
-        If it is `True`, it call recursively to itself to
-        get base object and if it is `False` then it just
-        return base object, not call recursively to find
-        base object.
+        If it is `True`, it follows the whole chain of clones
+        to get the base object, and if it is `False` then it just
+        returns the object directly cloned by `obj`.
 
     Returns
     -------
@@ -563,17 +562,27 @@ def get_clone_base(obj, strict=False, recursive=True):
         It will return `False` if `obj` is not a clone,
         and `strict` is `True`.
     """
-    if hasattr(obj, "CloneOf") and obj.CloneOf:
-        if recursive:
-            return get_clone_base(obj.CloneOf)
-        return obj.CloneOf
-    if get_type(obj) == "Clone" and obj.Objects:
-        if recursive:
-            return get_clone_base(obj.Objects[0])
-        return obj.Objects[0]
-    if strict:
+    base = obj
+    found = False
+    # names of the visited objects, to stop on cyclic clones
+    visited = set()
+    while True:
+        if hasattr(base, "CloneOf") and base.CloneOf:
+            base = base.CloneOf
+        elif get_type(base) == "Clone" and base.Objects:
+            base = base.Objects[0]
+        else:
+            break
+        found = True
+        if not recursive:
+            break
+        key = (base.Document.Name, base.Name)
+        if key in visited:
+            break
+        visited.add(key)
+    if strict and not found:
         return False
-    return obj
+    return base
 
 
 getCloneBase = get_clone_base